@@ -1,24 +1,36 @@
 """Utilities for locating the Femap type library file (.tlb)."""
 
 import os
-import glob
+import functools
+import hashlib
+import pickle
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 # Cache file location for last user-selected .tlb path
 _CACHE_FILE = Path(os.environ.get('TEMP', os.environ.get('TMP', '.'))) / '.femap_tlb_cache'
 
 
+@functools.lru_cache(maxsize=256)
+def _exists(path: str) -> bool:
+    """Memoized os.path.exists - each check is a stat syscall on Windows.
+
+    Results are cached for the lifetime of the process; call
+    _exists.cache_clear() if files may have been created or removed since.
+    """
+    return os.path.exists(path)
+
+
 def _load_cached_path() -> Optional[str]:
     """Load cached .tlb path from temp directory."""
+    # A single read doubles as the existence check. The path is served without
+    # re-checking it: callers that fail to load it call
+    # invalidate_cached_tlb_path() and resolve again.
     try:
-        if _CACHE_FILE.exists():
-            cached_path = _CACHE_FILE.read_text(encoding='utf-8').strip()
-            if cached_path and os.path.exists(cached_path):
-                return cached_path
-    except Exception:
-        pass
-    return None
+        return _CACHE_FILE.read_text(encoding='utf-8').strip() or None
+    except (OSError, ValueError):
+        return None
 
 
 def _save_cached_path(tlb_path: str) -> None:
@@ -29,6 +41,68 @@ def _save_cached_path(tlb_path: str) -> None:
         pass  # Silent failure - caching is optional
 
 
+def invalidate_cached_tlb_path() -> None:
+    """
+    Forget the cached .tlb path after it failed to load.
+
+    Removes the cache file and clears the in-process memoization so the next
+    get_tlb_path() call falls through to auto-detection or the file dialog.
+    """
+    try:
+        _CACHE_FILE.unlink()
+    except OSError:
+        pass
+    _exists.cache_clear()
+    _resolve_tlb_path.cache_clear()
+
+
+def parse_cache_path(tlb_path: str, kind: str, version: int) -> Optional[Path]:
+    """
+    Cache file for data extracted from a .tlb, keyed on its path, mtime and size.
+
+    Args:
+        tlb_path: Path to femap.tlb.
+        kind: Which generator the data belongs to (e.g. 'constants', 'stubs').
+        version: Format version of the cached data; bump it to invalidate old caches.
+
+    Returns:
+        Path in the temp directory, or None if the .tlb can't be stat'ed.
+    """
+    try:
+        st = os.stat(tlb_path)
+    except OSError:
+        return None
+    key = f"{version}|{tlb_path}|{st.st_mtime_ns}|{st.st_size}"
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+    return Path(tempfile.gettempdir()) / f'femap_{kind}_{digest}.pkl'
+
+
+def load_parse_cache(cache_path: Optional[Path]) -> Any:
+    """Return the data pickled at cache_path, or None if missing or unreadable."""
+    if cache_path is None:
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            data = pickle.load(f)
+    except Exception:
+        return None
+    print(f"Using cached parse: {cache_path}")
+    return data
+
+
+def save_parse_cache(cache_path: Optional[Path], data: Any) -> None:
+    """Pickle data to cache_path, replacing any previous entry atomically."""
+    if cache_path is None:
+        return
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass  # Silent failure - caching is optional
+
+
 def find_femap_install_dir() -> Optional[Path]:
     """
     Search common installation paths for Femap directory.
@@ -36,30 +110,33 @@ def find_femap_install_dir() -> Optional[Path]:
     Returns:
         Path to Femap installation directory, or None if not found.
     """
-    search_paths = [
-        r'C:\Program Files\Siemens\Femap *',
-        r'C:\Program Files (x86)\Siemens\Femap *',
+    parent_dirs = [
+        r'C:\Program Files\Siemens',
+        r'C:\Program Files (x86)\Siemens',
     ]
 
-    for pattern in search_paths:
-        matches = glob.glob(pattern)
-        if matches:
-            # Return the most recent version (sorted alphabetically, highest last)
-            return Path(sorted(matches)[-1])
+    for parent in parent_dirs:
+        try:
+            it = os.scandir(parent)
+        except OSError:
+            continue
+        # Match glob's 'Femap *' semantics: case-insensitive on Windows and
+        # following junctions/symlinks (entries carry their type, so is_dir()
+        # only stats for links)
+        with it:
+            candidates = [
+                entry.name for entry in it
+                if entry.name[:6].casefold() == 'femap ' and entry.is_dir()
+            ]
+        if candidates:
+            # Return the most recent version (highest name alphabetically)
+            return Path(parent) / max(candidates)
 
     return None
 
 
-def prompt_for_tlb_file(initial_dir: Optional[Path] = None) -> Optional[str]:
-    """
-    Show a file dialog to select the femap.tlb file.
-
-    Args:
-        initial_dir: Directory to start the file dialog in.
-
-    Returns:
-        Path to selected .tlb file, or None if user cancels.
-    """
+def _prompt_with_tkinter(initial: Optional[str]) -> Optional[str]:
+    """Fallback file dialog using tkinter (used when pywin32 is unavailable)."""
     try:
         import tkinter as tk
         from tkinter import filedialog
@@ -72,14 +149,6 @@ def prompt_for_tlb_file(initial_dir: Optional[Path] = None) -> Optional[str]:
     root.withdraw()
     root.attributes('-topmost', True)
 
-    # Determine initial directory
-    if initial_dir and initial_dir.exists():
-        initial = str(initial_dir)
-    else:
-        # Fallback to Siemens directory
-        siemens_dir = Path(r'C:\Program Files\Siemens')
-        initial = str(siemens_dir) if siemens_dir.exists() else None
-
     # Show file dialog
     tlb_path = filedialog.askopenfilename(
         title='Select Femap Type Library (femap.tlb)',
@@ -95,6 +164,50 @@ def prompt_for_tlb_file(initial_dir: Optional[Path] = None) -> Optional[str]:
     return tlb_path if tlb_path else None
 
 
+def prompt_for_tlb_file(initial_dir: Optional[Path] = None) -> Optional[str]:
+    """
+    Show a file dialog to select the femap.tlb file.
+
+    Uses the native Win32 dialog from pywin32, which avoids loading Tcl/Tk.
+    Falls back to tkinter if pywin32 is not installed.
+
+    Args:
+        initial_dir: Directory to start the file dialog in.
+
+    Returns:
+        Path to selected .tlb file, or None if user cancels.
+    """
+    # Determine initial directory
+    if initial_dir and initial_dir.exists():
+        initial = str(initial_dir)
+    else:
+        # Fallback to Siemens directory
+        siemens_dir = Path(r'C:\Program Files\Siemens')
+        initial = str(siemens_dir) if siemens_dir.exists() else None
+
+    try:
+        import win32con
+        import win32gui
+    except ImportError:
+        return _prompt_with_tkinter(initial)
+
+    dialog_args = {
+        'Title': 'Select Femap Type Library (femap.tlb)',
+        'Filter': 'Type Library Files\0*.tlb\0All Files\0*.*\0',
+        'Flags': win32con.OFN_FILEMUSTEXIST | win32con.OFN_HIDEREADONLY,
+    }
+    if initial:
+        dialog_args['InitialDir'] = initial
+
+    # Show file dialog (raises win32gui.error when the user cancels)
+    try:
+        tlb_path, _, _ = win32gui.GetOpenFileNameW(**dialog_args)
+    except win32gui.error:
+        return None
+
+    return tlb_path if tlb_path else None
+
+
 def get_tlb_path(cli_arg: Optional[str] = None) -> Optional[str]:
     """
     Resolve the path to femap.tlb using multiple strategies.
@@ -106,39 +219,49 @@ def get_tlb_path(cli_arg: Optional[str] = None) -> Optional[str]:
     4. Auto-detect in common installation paths
     5. Prompt user with file dialog (saves to cache)
 
+    The result is memoized per cli_arg for the lifetime of the process, so
+    repeat calls return without touching the filesystem or printing status
+    again. invalidate_cached_tlb_path() forces re-resolution.
+
     Args:
         cli_arg: Path from command-line --tlb argument, or None.
 
     Returns:
         Path to femap.tlb file, or None if not found/user cancelled.
     """
+    return _resolve_tlb_path(cli_arg)[0]
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_tlb_path(cli_arg: Optional[str]) -> Tuple[Optional[str], bool]:
+    """Implementation of get_tlb_path; also reports whether the path came from the cache file."""
     # 1. Command-line argument takes precedence
     if cli_arg:
-        if os.path.exists(cli_arg):
-            return cli_arg
+        if _exists(cli_arg):
+            return cli_arg, False
         else:
             print(f"WARNING: Specified .tlb file not found: {cli_arg}")
             # Continue to other methods instead of failing immediately
 
     # 2. Check environment variable
     env_path = os.getenv('FEMAP_TLB_PATH')
-    if env_path and os.path.exists(env_path):
+    if env_path and _exists(env_path):
         print(f"Using FEMAP_TLB_PATH: {env_path}")
-        return env_path
+        return env_path, False
 
     # 3. Check cached path from previous user selection
     cached_path = _load_cached_path()
     if cached_path:
         print(f"Using cached path: {cached_path}")
-        return cached_path
+        return cached_path, True
 
     # 4. Auto-detect in common installation paths
     install_dir = find_femap_install_dir()
     if install_dir:
         tlb_path = install_dir / 'femap.tlb'
-        if tlb_path.exists():
+        if _exists(str(tlb_path)):
             print(f"Auto-detected: {tlb_path}")
-            return str(tlb_path)
+            return str(tlb_path), False
 
     # 5. Prompt user with file dialog
     print("Femap type library not found. Please select femap.tlb...")
@@ -148,7 +271,53 @@ def get_tlb_path(cli_arg: Optional[str] = None) -> Optional[str]:
         print(f"Selected: {selected_path}")
         # Save to cache for next time (silent failure if unsuccessful)
         _save_cached_path(selected_path)
-        return selected_path
+        return selected_path, False
 
     # User cancelled or no file found
-    return None
+    return None, False
+
+
+def load_type_library(cli_arg: Optional[str] = None) -> Optional[Tuple[str, Any]]:
+    """
+    Resolve femap.tlb via get_tlb_path() and load it with pythoncom.LoadTypeLib.
+
+    The cached path from a previous selection is served without re-checking
+    it, so it may be stale (e.g. after a Femap upgrade). If loading a path
+    that came from the cache fails, the cache entry is dropped and resolution
+    runs once more. Paths given via --tlb, FEMAP_TLB_PATH or auto-detection
+    are never retried, and the user's saved selection is left alone.
+
+    Args:
+        cli_arg: Path from command-line --tlb argument, or None.
+
+    Returns:
+        (tlb_path, typelib) for the path that loaded, or None after printing
+        an error.
+    """
+    tlb_path, from_cache = _resolve_tlb_path(cli_arg)
+    if not tlb_path:
+        print("ERROR: No type library selected")
+        return None
+
+    import pythoncom  # Deferred: loading pywin32 DLLs is the bulk of startup time
+
+    print(f"Loading type library: {tlb_path}")
+    try:
+        return tlb_path, pythoncom.LoadTypeLib(tlb_path)
+    except pythoncom.com_error as e:
+        print(f"Error loading type library: {e}")
+        if not from_cache:
+            return None
+
+    invalidate_cached_tlb_path()
+    retry_path = get_tlb_path(cli_arg)
+    if not retry_path or retry_path == tlb_path:
+        print("ERROR: No type library selected")
+        return None
+
+    print(f"Loading type library: {retry_path}")
+    try:
+        return retry_path, pythoncom.LoadTypeLib(retry_path)
+    except pythoncom.com_error as e:
+        print(f"Error loading type library: {e}")
+        return None
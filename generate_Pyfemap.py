@@ -12,8 +12,7 @@ Usage:
 
 import sys
 import argparse
-from win32com.client import makepy
-from femap_path_utils import get_tlb_path
+from femap_path_utils import load_type_library
 
 
 def main():
@@ -27,12 +26,15 @@ def main():
 
     args = parser.parse_args()
 
-    # Resolve .tlb file path
-    tlb_path = get_tlb_path(args.tlb)
-
-    if not tlb_path:
-        print("ERROR: Could not locate femap.tlb file")
+    # Resolve and load the .tlb up front: makepy reports a typelib it can't
+    # load and carries on, and this re-resolves once if the cached path is stale
+    loaded = load_type_library(args.tlb)
+    if loaded is None:
         sys.exit(1)
+    tlb_path, _ = loaded
+
+    # Deferred until the .tlb has loaded so --help and lookup failures exit quickly
+    from win32com.client import makepy
 
     print(f"\nGenerating Pyfemap.py from: {tlb_path}")
     print("This may take a minute...\n")
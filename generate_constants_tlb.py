@@ -18,20 +18,31 @@ Path Resolution:
 """
 
 import argparse
-import pythoncom
+import filecmp
+import heapq
+import io
+import os
+import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import NamedTuple, Dict, List, Tuple
-from femap_path_utils import get_tlb_path
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, NamedTuple, Dict, Iterable, List, Optional, Tuple
+from femap_path_utils import (
+    get_tlb_path, load_parse_cache, load_type_library, parse_cache_path, save_parse_cache,
+)
 
 # Type kind constants
 TKIND_ENUM = 0
 
+# Bump when the cached parse format changes so stale cache files are ignored
+_PARSE_CACHE_VERSION = 2
+
 
 class ConstantInfo(NamedTuple):
+    # The owning enum is the key of the dict these are stored under
     name: str
     value: int
-    enum_name: str
 
 
 # Configuration for alias class generation
@@ -173,283 +184,372 @@ ALIAS_CONFIG = {
 }
 
 
-def parse_constants_from_tlb(tlb_path: str) -> Dict[str, List[ConstantInfo]]:
-    """Parse constants directly from .tlb file (authoritative source)."""
-    print(f"Loading type library: {tlb_path}")
-    typelib = pythoncom.LoadTypeLib(tlb_path)
+def _build_alias_plan() -> List[Tuple[str, str, str, str, str, bool]]:
+    """Resolve ALIAS_CONFIG keys once into plan records.
 
-    constants: Dict[str, List[ConstantInfo]] = defaultdict(list)
-    count = typelib.GetTypeInfoCount()
+    Returns:
+        List of (config_key, enum_name, filter_prefix, class_name, prefix, use_nested)
+        in config order; filter_prefix is '' for non-virtual entries.
+    """
+    plan = []
+    for config_key, (class_name, prefix, use_nested) in ALIAS_CONFIG.items():
+        # Handle virtual enum syntax: "zColor:FPF_" means filter zColor by FPF_ prefix
+        enum_name, _, filter_prefix = config_key.partition(':')
+        plan.append((config_key, enum_name, filter_prefix, class_name, prefix, use_nested))
+    return plan
 
-    for i in range(count):
-        tinfo = typelib.GetTypeInfo(i)
-        name = typelib.GetDocumentation(i)[0]
-        attr = tinfo.GetTypeAttr()
 
-        # Only process enums (typekind == 0)
-        if attr.typekind != TKIND_ENUM:
+_ALIAS_PLAN = _build_alias_plan()
+
+# Enums covered by Tier 1 (excluded from Tier 2 auto-generation)
+_TIER1_ENUM_NAMES = frozenset(record[1] for record in _ALIAS_PLAN)
+
+
+def parse_constants_from_tlb(typelib) -> Dict[str, List[ConstantInfo]]:
+    """Parse constants directly from the loaded .tlb (authoritative source).
+
+    Each enum's members are returned sorted by value (stable, so aliases keep
+    their .tlb order); the generators rely on this and don't re-sort.
+    """
+    import pythoncom  # Already loaded by load_type_library; needed for com_error
+
+    constants: Dict[str, List[ConstantInfo]] = {}
+    count = typelib.GetTypeInfoCount()
+
+    # Classify by typekind first (cheap) so only enums pay for the
+    # GetTypeInfo/GetDocumentation/GetTypeAttr round trips
+    enum_indices = [i for i in range(count) if typelib.GetTypeInfoType(i) == TKIND_ENUM]
+
+    for i in enum_indices:
+        try:
+            tinfo = typelib.GetTypeInfo(i)
+            # Interned: used as the dict key for this enum's members
+            name = sys.intern(typelib.GetDocumentation(i)[0])
+            attr = tinfo.GetTypeAttr()
+
+            # Bind COM methods and the member list's append to locals once per enum
+            get_var_desc = tinfo.GetVarDesc
+            get_names = tinfo.GetNames
+            members: List[ConstantInfo] = []
+            append = members.append
+
+            # Extract enum members (non-integer values are skipped)
+            for j in range(attr.cVars):
+                vardesc = get_var_desc(j)
+                value = vardesc.value
+                if type(value) is int:
+                    append(ConstantInfo(get_names(vardesc.memid)[0], value))
+        except pythoncom.com_error as e:
+            # Skip the whole enum rather than emit a partial member list
+            print(f"Warning: skipping enum at type info index {i}: {e}")
             continue
+        constants[name] = members
+
+    # Drop enums that ended up with no integer members; sort the rest once here
+    by_value = attrgetter('value')
+    return {
+        name: sorted(members, key=by_value)
+        for name, members in constants.items() if members
+    }
+
+
+def load_cached_constants(tlb_path: str) -> Optional[Dict[str, List[ConstantInfo]]]:
+    """Return the constants cached for this exact .tlb file, or None on a miss.
+
+    The .tlb only changes on Femap upgrades, so reruns skip the COM traversal
+    (and never load pythoncom).
+    """
+    cached = load_parse_cache(parse_cache_path(tlb_path, 'constants', _PARSE_CACHE_VERSION))
+    if cached is None:
+        return None
+    return {
+        enum_name: list(map(ConstantInfo._make, members))
+        for enum_name, members in cached.items()
+    }
 
-        # Extract enum members
-        for j in range(attr.cVars):
-            try:
-                vardesc = tinfo.GetVarDesc(j)
-                member_name = tinfo.GetNames(vardesc.memid)[0]
-                member_value = vardesc.value
-                if isinstance(member_value, int):
-                    constants[name].append(ConstantInfo(member_name, member_value, name))
-            except Exception:
-                continue
 
-    return dict(constants)
+def save_cached_constants(tlb_path: str, constants: Dict[str, List[ConstantInfo]]) -> None:
+    """Cache parsed constants for load_cached_constants (silent on failure)."""
+    # Store plain tuples so the cache doesn't depend on the ConstantInfo class path
+    plain = {
+        enum_name: [(c.name, c.value) for c in members]
+        for enum_name, members in constants.items()
+    }
+    save_parse_cache(parse_cache_path(tlb_path, 'constants', _PARSE_CACHE_VERSION), plain)
+
+
+_DIGITS = frozenset('0123456789')
+
+
+def _sanitize(name: str) -> str:
+    """Prefix an underscore if name starts with a digit ([:1] is safe on '')."""
+    return '_' + name if name[:1] in _DIGITS else name
 
 
 def strip_prefix(name: str, prefix: str) -> str:
     """Strip prefix from constant name, handling edge cases."""
-    if name.startswith(prefix):
-        result = name[len(prefix):]
-        # If result starts with digit, prefix with underscore
-        if result and result[0].isdigit():
-            result = '_' + result
-        return result
-    return name
+    return _sanitize(name.removeprefix(prefix))
 
 
-def generate_nested_class(constants: List[ConstantInfo], prefix: str, enum_name: str) -> Tuple[List[str], List[str]]:
+def generate_nested_class(constants: List[ConstantInfo], prefix: str, enum_name: str) -> Tuple[str, List[str]]:
     """Generate nested class structure with IntEnum subclasses.
 
     E.g., FGD_ELEM_BYCOLOR -> GroupDef.ELEM.BYCOLOR
 
+    Expects constants sorted by value, as returned by parse_constants_from_tlb.
+
     Returns:
-        Tuple of (lines, nested_class_names) for generating union type alias
+        Tuple of (class body text, nested_class_names) for generating union type alias
     """
-    lines = []
+    buf = io.StringIO()
+    write = buf.write
     nested_class_names = []
 
     # Group by secondary prefix (e.g., ELEM, NODE, CSYS, etc.)
-    groups = defaultdict(list)
+    grouped = []
     ungrouped = []
 
     for const in constants:
         stripped = strip_prefix(const.name, prefix)
         # Split on first underscore to get secondary group
-        parts = stripped.split('_', 1)
-        if len(parts) == 2:
-            group_name = parts[0]
-            member_name = parts[1]
-            groups[group_name].append((member_name, const))
+        group_name, sep, member_name = stripped.partition('_')
+        if sep:
+            grouped.append((sys.intern(group_name), member_name, const.value))
         else:
-            ungrouped.append((stripped, const))
+            ungrouped.append((stripped, const.value))
+
+    # Stable sort by group name (members stay in value order), then walk each run once
+    grouped.sort(key=itemgetter(0))
 
     # Generate nested IntEnum classes for each group
-    for group_name in sorted(groups.keys()):
-        members = groups[group_name]
-        lines.append(f"    class {group_name}(IntEnum):")
+    for group_name, members in groupby(grouped, key=itemgetter(0)):
+        write(f"    class {group_name}(IntEnum):\n")
         nested_class_names.append(group_name)
-        for member_name, const in sorted(members, key=lambda x: x[1].value):
-            # Clean up member name
-            if member_name and member_name[0].isdigit():
-                member_name = '_' + member_name
-            lines.append(f"        {member_name} = {const.value}")
-        lines.append("")
+        for _, member_name, value in members:
+            write(f"        {_sanitize(member_name)} = {value}\n")
+        write("\n")
 
     # Add ungrouped constants at class level (as plain ints)
     if ungrouped:
-        lines.append("    # Ungrouped constants")
-        for member_name, const in sorted(ungrouped, key=lambda x: x[1].value):
-            lines.append(f"    {member_name} = {const.value}")
-        lines.append("")
-
-    return lines, nested_class_names
+        write("    # Ungrouped constants\n")
+        for member_name, value in ungrouped:
+            write(f"    {member_name} = {value}\n")
+        write("\n")
 
+    return buf.getvalue(), nested_class_names
 
-def generate_flat_class(constants: list[ConstantInfo], prefix: str, enum_name: str, class_name: str) -> list[str]:
-    """Generate a flat IntEnum class with all constants as members."""
-    lines = []
 
-    for const in sorted(constants, key=lambda x: x.value):
-        alias = strip_prefix(const.name, prefix)
-        if not alias:
-            alias = const.name  # Fallback to full name if prefix is the entire name
-        lines.append(f"    {alias} = {const.value}")
+def generate_flat_class(constants: list[ConstantInfo], prefix: str, enum_name: str, class_name: str) -> str:
+    """Generate a flat IntEnum class with all constants as members (input is value-sorted)."""
+    # Fall back to the full name if the prefix is the entire name
+    return ''.join(
+        f"    {strip_prefix(const.name, prefix) or const.name} = {const.value}\n"
+        for const in constants
+    )
 
-    return lines
 
+def group_by_prefix(const_list: List[ConstantInfo]) -> Dict[str, List[ConstantInfo]]:
+    """Bucket constants by their leading prefix (e.g., APIWARN_, CTRLDEF_, FCL_, FPF_).
 
-def detect_prefixes(const_list: List[ConstantInfo]) -> Dict[str, List[ConstantInfo]]:
-    """Detect common prefixes in constant names for nested subclassing."""
+    Names without an underscore go under ''. Members keep their input order.
+    """
     prefix_groups = defaultdict(list)
 
     for const in const_list:
-        # Try to find common prefix pattern (e.g., APIWARN_, CTRLDEF_, FCL_, FPF_)
-        parts = const.name.split('_', 1)
-        if len(parts) > 1:
-            prefix = parts[0] + '_'
-            prefix_groups[prefix].append(const)
-        else:
-            # No underscore - put in root
-            prefix_groups[''].append(const)
+        head, sep, _ = const.name.partition('_')
+        # No underscore - put in root
+        prefix_groups[head + sep if sep else ''].append(const)
 
-    # Only use nested structure if multiple prefixes detected
-    if len(prefix_groups) > 1 and '' not in prefix_groups:
-        return dict(prefix_groups)
-    else:
-        # Single prefix or mixed - flatten
-        return {'': const_list}
-
-
-def generate_tier2_direct(enums: Dict[str, List[ConstantInfo]]) -> List[str]:
-    """Generate IntEnum classes with nested subclasses for multi-prefix enums."""
-    lines = []
-    lines.append('')
-    lines.append('# ' + '='*70)
-    lines.append('# Tier 2: Auto-Generated Enums (Direct Mapping)')
-    lines.append('# ' + '='*70)
-    lines.append('# The following enums are generated directly from the .tlb file')
-    lines.append('# Enums with multiple prefixes use nested subclasses for organization.')
-    lines.append('# Constant names are preserved exactly as they appear in the .tlb.')
-    lines.append('')
+    return prefix_groups
+
+
+def generate_tier2_direct(write: Callable[[str], Any],
+                          enums: Dict[str, List[ConstantInfo]], enum_names: Iterable[str]) -> Tuple[int, int]:
+    """Write IntEnum classes with nested subclasses for multi-prefix enums.
+
+    Args:
+        write: Sink for the generated source (e.g. the output file's write).
+        enums: All parsed enums.
+        enum_names: Names of the enums to emit, in output order.
+
+    Returns:
+        (tier2_count, tier2_enums) - constants and enums written.
+    """
+    write(
+        '\n'
+        '# ' + '='*70 + '\n'
+        '# Tier 2: Auto-Generated Enums (Direct Mapping)\n'
+        '# ' + '='*70 + '\n'
+        '# The following enums are generated directly from the .tlb file\n'
+        '# Enums with multiple prefixes use nested subclasses for organization.\n'
+        '# Constant names are preserved exactly as they appear in the .tlb.\n'
+        '\n'
+    )
 
     tier2_count = 0
     tier2_enums = 0
 
-    for enum_name in sorted(enums.keys()):
+    for enum_name in enum_names:
         const_list = enums[enum_name]
         if not const_list:
             continue
 
         tier2_enums += 1
         tier2_count += len(const_list)
+        write(render_tier2_class(enum_name, const_list))
 
-        # Detect if this enum has multiple prefixes
-        prefix_groups = detect_prefixes(const_list)
+    return tier2_count, tier2_enums
 
-        if len(prefix_groups) == 1 and '' in prefix_groups:
-            # Simple flat enum
-            lines.append(f'class {enum_name}(IntEnum):')
-            lines.append(f'    """Constants from {enum_name} enum (auto-generated)."""')
-            lines.append('')
 
-            for const in sorted(const_list, key=lambda c: c.value):
-                lines.append(f'    {const.name} = {const.value}')
+def render_tier2_class(enum_name: str, const_list: List[ConstantInfo]) -> str:
+    """Render one Tier 2 class, flat or nested by prefix (const_list must be non-empty)."""
+    buf = io.StringIO()
+    write = buf.write
 
-            lines.append('')
-            lines.append('')
-        else:
-            # Nested structure for multiple prefixes
-            lines.append(f'class {enum_name}:')
-            lines.append(f'    """Constants from {enum_name} enum (auto-generated, nested by prefix)."""')
-            lines.append('')
+    # Single pass bucketing by prefix (e.g., APIWARN_, CTRLDEF_); only use
+    # nested structure if multiple prefixes detected and every name has one
+    prefix_groups = group_by_prefix(const_list)
 
-            for prefix in sorted(prefix_groups.keys()):
-                # Create nested class for each prefix
-                class_name = prefix.rstrip('_') if prefix else 'Other'
-                lines.append(f'    class {class_name}(IntEnum):')
-                lines.append(f'        """Constants with {prefix} prefix."""')
-                lines.append('')
+    if len(prefix_groups) == 1 or '' in prefix_groups:
+        # Simple flat enum (single prefix or mixed)
+        write(f'class {enum_name}(IntEnum):\n')
+        write(f'    """Constants from {enum_name} enum (auto-generated)."""\n')
+        write('\n')
+        write(''.join(f'    {const.name} = {const.value}\n' for const in const_list))
+        write('\n\n')
+    else:
+        # Nested structure for multiple prefixes
+        write(f'class {enum_name}:\n')
+        write(f'    """Constants from {enum_name} enum (auto-generated, nested by prefix)."""\n')
+        write('\n')
 
-                for const in sorted(prefix_groups[prefix], key=lambda c: c.value):
-                    lines.append(f'        {const.name} = {const.value}')
+        for prefix in sorted(prefix_groups):
+            # Create nested class for each prefix
+            class_name = prefix.rstrip('_') if prefix else 'Other'
+            write(f'    class {class_name}(IntEnum):\n')
+            write(f'        """Constants with {prefix} prefix."""\n')
+            write('\n')
+            write(''.join(f'        {const.name} = {const.value}\n' for const in prefix_groups[prefix]))
+            write('\n')
 
-                lines.append('')
+        write('\n')
 
-            lines.append('')
+    return buf.getvalue()
 
-    return lines, tier2_count, tier2_enums
 
+def render_alias_class(enum_name: str, class_name: str, prefix: str, use_nested: bool,
+                       const_list: List[ConstantInfo]) -> str:
+    """Render one Tier 1 alias class.
 
-def generate_constants_file(constants: dict[str, list[ConstantInfo]], output_path: Path):
-    """Generate the femap_constants.py file."""
-
-    lines = [
-        '"""',
-        'femap_constants.py - Type-safe constant aliases for Femap API',
-        '',
-        'Auto-generated by generate_constants_tlb.py from Femap type library (.tlb)',
-        'DO NOT EDIT MANUALLY - regenerate using: python generate_constants_tlb.py',
-        '',
-        'Uses IntEnum for type safety - each enum is a distinct type that',
-        'type checkers can verify (e.g., ReturnCode vs Color are not interchangeable).',
-        '',
-        'Usage:',
-        '    from femap_constants import ReturnCode, Entity, Message, Color',
-        '',
-        '    if rc == ReturnCode.OK:',
-        '        app.feAppMessage(Message.NORMAL, "Success!")',
-        '"""',
-        '',
-        'from enum import IntEnum',
-        '',
-        '',
-    ]
+    Returns:
+        Source text for the class (plus its Type alias for nested groupings).
+    """
+    buf = io.StringIO()
+    write = buf.write
+
+    # Generate class header
+    if use_nested:
+        # Nested classes can't be IntEnum, use regular class as container
+        write(f'class {class_name}:\n')
+        write(f'    """Constants from {enum_name} enum (nested grouping)."""\n')
+    else:
+        write(f'class {class_name}(IntEnum):\n')
+        write(f'    """Constants from {enum_name} enum."""\n')
+    write('\n')
+
+    # Generate class body
+    if use_nested:
+        body, nested_names = generate_nested_class(const_list, prefix, enum_name)
+        write(body)
+        write('\n')
+        # Generate type alias as union of nested IntEnum classes
+        if nested_names:
+            union_parts = [f'{class_name}.{n}' for n in nested_names]
+            write(f'# Type alias for {class_name} nested IntEnums\n')
+            write(f'{class_name}Type = {" | ".join(union_parts)}\n')
+            write('\n')
+    else:
+        write(generate_flat_class(const_list, prefix, enum_name, class_name))
+        write('\n')
+
+    write('\n')
+    return buf.getvalue()
+
+
+class GenerationSummary(NamedTuple):
+    tier1_processed: List[Tuple[str, str, int]]  # (config_key, class_name, count)
+    tier1_skipped: List[str]
+    tier1_const_count: int
+    tier2_enum_count: int
+    tier2_const_count: int
+    total_enums: int
+    total_constants: int
+
+
+def write_constants_module(write: Callable[[str], Any],
+                           constants: Dict[str, List[ConstantInfo]]) -> GenerationSummary:
+    """Emit the femap_constants.py source through write().
+
+    Returns:
+        The counts written to the module's summary comment, for reporting.
+    """
+    write(
+        '"""\n'
+        'femap_constants.py - Type-safe constant aliases for Femap API\n'
+        '\n'
+        'Auto-generated by generate_constants_tlb.py from Femap type library (.tlb)\n'
+        'DO NOT EDIT MANUALLY - regenerate using: python generate_constants_tlb.py\n'
+        '\n'
+        'Uses IntEnum for type safety - each enum is a distinct type that\n'
+        'type checkers can verify (e.g., ReturnCode vs Color are not interchangeable).\n'
+        '\n'
+        'Usage:\n'
+        '    from femap_constants import ReturnCode, Entity, Message, Color\n'
+        '\n'
+        '    if rc == ReturnCode.OK:\n'
+        '        app.feAppMessage(Message.NORMAL, "Success!")\n'
+        '"""\n'
+        '\n'
+        'from enum import IntEnum\n'
+        '\n'
+        '\n'
+    )
 
     # Track which enums were processed in Tier 1 (curated aliases)
     tier1_processed = []
     tier1_skipped = []
-    tier1_enum_names = set()  # Track which enum names are in ALIAS_CONFIG
-
-    # Tier 1: Curated aliases from ALIAS_CONFIG
-    for config_key, config in ALIAS_CONFIG.items():
-        # Handle virtual enum syntax: "zColor:FPF_" means filter zColor by FPF_ prefix
-        if ':' in config_key:
-            enum_name, filter_prefix = config_key.split(':', 1)
-        else:
-            enum_name = config_key
-            filter_prefix = None
+    # Per-enum prefix buckets, built once and shared by virtual configs on the same enum
+    prefix_index: Dict[str, Dict[str, List[ConstantInfo]]] = {}
 
+    # Tier 1: Curated aliases from ALIAS_CONFIG (keys pre-resolved in _ALIAS_PLAN)
+    for config_key, enum_name, filter_prefix, class_name, prefix, use_nested in _ALIAS_PLAN:
         if enum_name not in constants:
             tier1_skipped.append(config_key)
             continue
 
-        # Track that this enum is in ALIAS_CONFIG (for Tier 2 filtering)
-        tier1_enum_names.add(enum_name)
-
-        class_name, prefix, use_nested = config
         const_list = constants[enum_name]
 
         # Filter constants if a filter prefix is specified
         if filter_prefix:
-            const_list = [c for c in const_list if c.name.startswith(filter_prefix)]
+            if filter_prefix.find('_') == len(filter_prefix) - 1:
+                # Single-token prefix like FPF_ - look up the pre-bucketed members
+                if enum_name not in prefix_index:
+                    prefix_index[enum_name] = group_by_prefix(const_list)
+                const_list = prefix_index[enum_name].get(filter_prefix, [])
+            else:
+                const_list = [c for c in const_list if c.name.startswith(filter_prefix)]
             if not const_list:
                 tier1_skipped.append(config_key)
                 continue
 
         tier1_processed.append((config_key, class_name, len(const_list)))
-
-        # Generate class header
-        if use_nested:
-            # Nested classes can't be IntEnum, use regular class as container
-            lines.append(f'class {class_name}:')
-            lines.append(f'    """Constants from {enum_name} enum (nested grouping)."""')
-        else:
-            lines.append(f'class {class_name}(IntEnum):')
-            lines.append(f'    """Constants from {enum_name} enum."""')
-        lines.append('')
-
-        # Generate class body
-        if use_nested:
-            body, nested_names = generate_nested_class(const_list, prefix, enum_name)
-            lines.extend(body)
-            lines.append('')
-            # Generate type alias as union of nested IntEnum classes
-            if nested_names:
-                union_parts = [f'{class_name}.{n}' for n in nested_names]
-                lines.append(f'# Type alias for {class_name} nested IntEnums')
-                lines.append(f'{class_name}Type = {" | ".join(union_parts)}')
-                lines.append('')
-        else:
-            body = generate_flat_class(const_list, prefix, enum_name, class_name)
-            lines.extend(body)
-            lines.append('')
-
-        lines.append('')
+        write(render_alias_class(enum_name, class_name, prefix, use_nested, const_list))
 
     # Tier 2: Auto-generated enums (all enums NOT in ALIAS_CONFIG)
-    tier2_enums = {k: v for k, v in constants.items() if k not in tier1_enum_names}
+    tier2_names = sorted(constants.keys() - _TIER1_ENUM_NAMES)
 
-    if tier2_enums:
-        tier2_lines, tier2_const_count, tier2_enum_count = generate_tier2_direct(tier2_enums)
-        lines.extend(tier2_lines)
+    if tier2_names:
+        tier2_const_count, tier2_enum_count = generate_tier2_direct(write, constants, tier2_names)
     else:
         tier2_const_count = 0
         tier2_enum_count = 0
@@ -459,38 +559,65 @@ def generate_constants_file(constants: dict[str, list[ConstantInfo]], output_pat
     total_enums = len(tier1_processed) + tier2_enum_count
     total_constants = tier1_const_count + tier2_const_count
 
-    # Add summary comment at the end
-    lines.append('# ' + '=' * 70)
-    lines.append('# Generation Summary')
-    lines.append('# ' + '=' * 70)
-    lines.append(f'# Tier 1: Curated Aliases ({len(tier1_processed)} enums, {tier1_const_count} constants)')
+    # Add summary comment at the end (no trailing newline after the last line)
+    write('# ' + '=' * 70 + '\n')
+    write('# Generation Summary\n')
+    write('# ' + '=' * 70 + '\n')
+    write(f'# Tier 1: Curated Aliases ({len(tier1_processed)} enums, {tier1_const_count} constants)\n')
     for enum_name, class_name, count in tier1_processed:
-        lines.append(f'#   {class_name} ({count} constants) from {enum_name}')
+        write(f'#   {class_name} ({count} constants) from {enum_name}\n')
     if tier1_skipped:
-        lines.append(f'# Tier 1 Skipped: {len(tier1_skipped)} enums (not found in .tlb):')
+        write(f'# Tier 1 Skipped: {len(tier1_skipped)} enums (not found in .tlb):\n')
         for enum_name in tier1_skipped:
-            lines.append(f'#   {enum_name}')
-    lines.append('#')
-    lines.append(f'# Tier 2: Auto-Generated ({tier2_enum_count} enums, {tier2_const_count} constants)')
-    lines.append('#   (All remaining enums from .tlb with direct mapping)')
-    lines.append('#')
-    lines.append(f'# Total: {total_enums} enums, {total_constants} constants')
-
-    # Write file
-    output_path.write_text('\n'.join(lines), encoding='utf-8')
-    print(f"Generated {output_path}")
-    print(f"  Tier 1 (Curated): {len(tier1_processed)} enums, {tier1_const_count} constants")
-    print(f"  Tier 2 (Auto-gen): {tier2_enum_count} enums, {tier2_const_count} constants")
-    print(f"  Total: {total_enums} enums, {total_constants} constants")
-    if tier1_skipped:
-        print(f"  Tier 1 Skipped: {len(tier1_skipped)} enums (not in .tlb)")
+            write(f'#   {enum_name}\n')
+    write('#\n')
+    write(f'# Tier 2: Auto-Generated ({tier2_enum_count} enums, {tier2_const_count} constants)\n')
+    write('#   (All remaining enums from .tlb with direct mapping)\n')
+    write('#\n')
+    write(f'# Total: {total_enums} enums, {total_constants} constants')
+
+    return GenerationSummary(tier1_processed, tier1_skipped, tier1_const_count,
+                             tier2_enum_count, tier2_const_count, total_enums, total_constants)
+
+
+def generate_constants_file(constants: dict[str, list[ConstantInfo]], output_path: Path):
+    """Generate the femap_constants.py file.
+
+    Output is streamed to a sibling .tmp file, which atomically replaces
+    output_path only if its content changed. An interrupted run never leaves
+    a truncated module behind, and an identical file keeps its mtime so IDE
+    indexes and downstream rebuilds aren't invalidated.
+    """
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    try:
+        with tmp_path.open('w', encoding='utf-8', buffering=1 << 20) as f:
+            summary = write_constants_module(f.write, constants)
+
+        unchanged = output_path.exists() and filecmp.cmp(tmp_path, output_path, shallow=False)
+        if unchanged:
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    if unchanged:
+        print(f"{output_path} is up to date (not rewritten)")
+    else:
+        print(f"Generated {output_path}")
+    print(f"  Tier 1 (Curated): {len(summary.tier1_processed)} enums, {summary.tier1_const_count} constants")
+    print(f"  Tier 2 (Auto-gen): {summary.tier2_enum_count} enums, {summary.tier2_const_count} constants")
+    print(f"  Total: {summary.total_enums} enums, {summary.total_constants} constants")
+    if summary.tier1_skipped:
+        print(f"  Tier 1 Skipped: {len(summary.tier1_skipped)} enums (not in .tlb)")
 
 
 def print_available_enums(constants: Dict[str, List[ConstantInfo]]):
     """Print all available enums for reference."""
     print("\nAll available enums in .tlb:")
     print("-" * 50)
-    for enum_name in sorted(constants.keys()):
+    for enum_name in sorted(constants):
         const_list = constants[enum_name]
         # Get common prefix
         if const_list:
@@ -499,7 +626,7 @@ def print_available_enums(constants: Dict[str, List[ConstantInfo]]):
                 parts = c.name.split('_')
                 if len(parts) >= 2:
                     prefixes.add(parts[0] + '_')
-            prefix_str = ', '.join(sorted(prefixes)[:3])
+            prefix_str = ', '.join(heapq.nsmallest(3, prefixes))
             if len(prefixes) > 3:
                 prefix_str += '...'
         else:
@@ -526,6 +653,11 @@ def main():
         action='store_true',
         help='List all available enums and exit'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-parse the .tlb even if a cached parse of the same file exists'
+    )
     args = parser.parse_args()
 
     # Resolve the .tlb path using multiple strategies
@@ -538,7 +670,16 @@ def main():
     output_path = script_dir / args.output
 
     print("Parsing .tlb constants...")
-    constants = parse_constants_from_tlb(tlb_path)
+    constants = None if args.no_cache else load_cached_constants(tlb_path)
+
+    if constants is None:
+        # Only a cache miss loads pythoncom and the type library
+        loaded = load_type_library(args.tlb)
+        if loaded is None:
+            return 1
+        tlb_path, typelib = loaded
+        constants = parse_constants_from_tlb(typelib)
+        save_cached_constants(tlb_path, constants)
     print(f"Found {sum(len(v) for v in constants.values())} constants in {len(constants)} enums")
 
     if args.list_enums:
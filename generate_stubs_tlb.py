@@ -16,10 +16,14 @@ Path Resolution:
 """
 
 import argparse
-import pythoncom
+import functools
 import re
+from collections import defaultdict
+from operator import itemgetter
 from typing import Dict, List, Tuple, Set, Any, Optional
-from femap_path_utils import get_tlb_path
+from femap_path_utils import (
+    get_tlb_path, load_parse_cache, load_type_library, parse_cache_path, save_parse_cache,
+)
 
 # VT type codes to Python type names
 VT_NAMES = {
@@ -48,6 +52,9 @@ VT_NAMES = {
     25: 'int',      # VT_HRESULT
 }
 
+# Bump when the extracted (enums, interfaces) structure changes to invalidate old caches
+_PARSE_CACHE_VERSION = 1
+
 # Type kind constants
 TKIND_ENUM = 0
 TKIND_RECORD = 1
@@ -91,6 +98,18 @@ for base_enum, subsets in ENUM_UNION_MAP.items():
         # Insert primary alias at the front
         subsets.insert(0, ENUM_ALIAS_MAP[base_enum])
 
+# Every alias name either map can produce, for tracking femap_constants imports
+ALL_ALIASES = frozenset(ENUM_ALIAS_MAP.values()).union(*ENUM_UNION_MAP.values())
+
+# Identifier tokens in a translated type string (e.g. "Tuple[ReturnCode, int]")
+_IDENT_RE = re.compile(r'[A-Za-z_]\w*')
+
+
+# Parameter names that are keywords or shadow builtins; emitted with a trailing '_'
+_RESERVED = frozenset({
+    'type', 'id', 'list', 'set', 'from', 'import', 'class', 'in', 'is', 'not', 'and', 'or',
+})
+
 
 # Version suffix pattern: function name ending in digits (e.g., Function2, Function3)
 VERSION_SUFFIX_PATTERN = re.compile(r'^(.+?)(\d+)$')
@@ -167,7 +186,33 @@ def get_version_hint(method_name: str, version_map: Dict[str, Dict[int, Dict]])
     return f'Newer version available: {latest_name}'
 
 
-def resolve_type(tinfo, typedesc) -> str:
+def resolve_type(tinfo, typedesc, cache: Optional[Dict[Any, str]] = None) -> str:
+    """Resolve a type descriptor to a Python type string.
+
+    Interfaces reuse a small set of typedescs across hundreds of members, and
+    VT_USERDEFINED lookups are COM round trips, so callers may pass a
+    typedesc -> result dict to memoize. hrefs are relative to tinfo, so a
+    cache must only ever be used with one ITypeInfo (extract_interface_info
+    keeps one per interface). Unhashable typedescs (e.g. a default value that
+    is a list) are resolved uncached.
+    """
+    # Bare VT codes are the most common case and need neither tinfo nor the cache
+    if type(typedesc) is int:
+        return VT_NAMES.get(typedesc, 'Any')
+
+    if cache is None:
+        return _resolve_type(tinfo, typedesc, None)
+    try:
+        return cache[typedesc]
+    except KeyError:
+        pass
+    except TypeError:
+        return _resolve_type(tinfo, typedesc, cache)
+    result = cache[typedesc] = _resolve_type(tinfo, typedesc, cache)
+    return result
+
+
+def _resolve_type(tinfo, typedesc, cache: Optional[Dict[Any, str]]) -> str:
     """
     Resolve a type descriptor to a Python type string.
 
@@ -178,16 +223,14 @@ def resolve_type(tinfo, typedesc) -> str:
     - VT_PTR: (26, inner) = pointer to another type
     - VT_SAFEARRAY: (27, inner) = array of type
     - Nested in elemdesc: ((29, 256), 0, None) = VT_USERDEFINED with flags
+
+    Simple ints never get here; resolve_type answers them directly.
     """
     if typedesc is None:
         return 'Any'
 
-    # Handle simple int
-    if isinstance(typedesc, int):
-        return VT_NAMES.get(typedesc, 'Any')
-
     # Handle tuple format
-    if isinstance(typedesc, tuple):
+    if type(typedesc) is tuple:
         if len(typedesc) == 0:
             return 'Any'
 
@@ -195,23 +238,23 @@ def resolve_type(tinfo, typedesc) -> str:
 
         # Check if this is an elemdesc tuple: (type_desc, flags, default)
         # where type_desc itself could be a tuple like (29, href)
-        if isinstance(vt, tuple):
+        if type(vt) is tuple:
             # The first element is the actual type descriptor
-            return resolve_type(tinfo, vt)
+            return resolve_type(tinfo, vt, cache)
 
         # vt is the type code
-        if isinstance(vt, int):
+        if type(vt) is int:
             if vt == 26:  # VT_PTR
                 # Pointer - get the inner type
                 inner = typedesc[1] if len(typedesc) > 1 else None
-                inner_type = resolve_type(tinfo, inner)
+                inner_type = resolve_type(tinfo, inner, cache)
                 # Don't wrap basic types in pointer notation
                 return inner_type
 
             elif vt == 27:  # VT_SAFEARRAY
                 inner = typedesc[1] if len(typedesc) > 1 else None
                 if inner is not None:
-                    elem_type = resolve_type(tinfo, inner)
+                    elem_type = resolve_type(tinfo, inner, cache)
                     return f'Tuple[{elem_type}, ...]'
                 return 'Tuple[Any, ...]'
 
@@ -232,7 +275,7 @@ def resolve_type(tinfo, typedesc) -> str:
     return 'Any'
 
 
-def get_elemdesc_type(tinfo, elemdesc) -> Tuple[str, bool]:
+def get_elemdesc_type(tinfo, elemdesc, cache: Optional[Dict[Any, str]] = None) -> Tuple[str, bool]:
     """Extract type from an ELEMDESC structure.
 
     elemdesc is a tuple: (type_desc, flags, default_value)
@@ -244,29 +287,20 @@ def get_elemdesc_type(tinfo, elemdesc) -> Tuple[str, bool]:
     Returns: (type_string, is_output_param)
     PARAMFLAG_FOUT = 0x2 indicates an output parameter
     """
-    if elemdesc is None:
+    # elemdesc is (type_desc, flags, default) or just type_desc; anything else
+    # (None, a bare int, an empty tuple) carries no usable type
+    if type(elemdesc) is not tuple or not elemdesc:
         return ('Any', False)
 
-    is_output = False
-
-    # elemdesc is (type_desc, flags, default) or just type_desc
-    if isinstance(elemdesc, tuple) and len(elemdesc) >= 2:
-        # Check flags for PARAMFLAG_FOUT (0x2)
-        flags = elemdesc[1]
-        if isinstance(flags, int) and (flags & 0x2):
-            is_output = True
+    # Check flags for PARAMFLAG_FOUT (0x2)
+    flags = elemdesc[1] if len(elemdesc) >= 2 else 0
+    is_output = type(flags) is int and (flags & 0x2) != 0
 
-    if isinstance(elemdesc, tuple) and len(elemdesc) >= 1:
-        return (resolve_type(tinfo, elemdesc), is_output)
+    return (resolve_type(tinfo, elemdesc, cache), is_output)
 
-    return ('Any', is_output)
 
-
-def extract_enum_values(typelib, idx: int) -> Dict[str, int]:
+def extract_enum_values(tinfo, attr) -> Dict[str, int]:
     """Extract enum member names and values."""
-    tinfo = typelib.GetTypeInfo(idx)
-    attr = tinfo.GetTypeAttr()
-
     members = {}
     for j in range(attr.cVars):
         vardesc = tinfo.GetVarDesc(j)
@@ -277,19 +311,26 @@ def extract_enum_values(typelib, idx: int) -> Dict[str, int]:
     return members
 
 
-def extract_interface_info(typelib, idx: int, enums: Set[str]) -> Optional[Dict]:
-    """Extract properties and methods from a DISPATCH interface."""
-    tinfo = typelib.GetTypeInfo(idx)
-    name = typelib.GetDocumentation(idx)[0]
-    attr = tinfo.GetTypeAttr()
+def extract_interface_info(tinfo, attr, name: str, enums: Set[str]) -> Optional[Dict]:
+    """Extract properties and methods from a DISPATCH interface.
 
+    tinfo/attr/name are the ITypeInfo, TYPEATTR and name already fetched by extract_typelib().
+    """
     # Only process DISPATCH interfaces (typekind == 4)
     if attr.typekind != TKIND_DISPATCH:
         return None
 
+    # typedesc -> resolved type; scoped to this interface because hrefs are
+    # relative to its tinfo
+    type_cache: Dict[Any, str] = {}
+
     properties = {}  # name -> (type, has_setter)
     methods = []
-    indexed_properties = {}  # name -> {'getter_params': [...], 'setter_params': [...], 'type': str}
+    # name -> {'getter_params': [...], 'setter_params': [...], 'type': str}; 'type' stays
+    # 'Any' for setter-only properties
+    indexed_properties: Dict[str, Dict[str, Any]] = defaultdict(
+        lambda: {'getter_params': None, 'setter_params': None, 'type': 'Any'}
+    )
 
     # Get variables (properties defined via cVars) - these are simple properties
     for j in range(attr.cVars):
@@ -298,47 +339,48 @@ def extract_interface_info(typelib, idx: int, enums: Set[str]) -> Optional[Dict]
             var_names = tinfo.GetNames(vardesc.memid)
             if var_names:
                 var_name = var_names[0]
-                var_type = resolve_type(tinfo, vardesc.elemdescVar)
+                var_type = resolve_type(tinfo, vardesc.elemdescVar, type_cache)
                 # Properties from vars typically have both getter and setter
                 properties[var_name] = (var_type, True)
         except Exception:
             continue
 
-    # Get functions (includes property getters/setters and methods)
+    # Get functions (includes property getters/setters and methods).
+    # Fetch every FUNCDESC with its names first, so the classification loop
+    # below is pure Python; entries whose COM calls fail are skipped.
+    funcs = []
+    get_func_desc = tinfo.GetFuncDesc
+    get_names = tinfo.GetNames
     for j in range(attr.cFuncs):
         try:
-            funcdesc = tinfo.GetFuncDesc(j)
+            funcdesc = get_func_desc(j)
+            func_names = get_names(funcdesc.memid)
         except Exception:
             continue
+        if func_names:
+            funcs.append((funcdesc, func_names))
 
-        try:
-            func_names = tinfo.GetNames(funcdesc.memid)
-        except Exception:
-            continue
-
-        if not func_names:
-            continue
-
+    for funcdesc, func_names in funcs:
         func_name = func_names[0]
+        invkind = funcdesc.invkind
+        arg_count = len(funcdesc.args) if funcdesc.args else 0
 
         # Handle property getters
-        if funcdesc.invkind == INVOKE_PROPERTYGET:
-            ret_type = resolve_type(tinfo, funcdesc.rettype)
+        if invkind == INVOKE_PROPERTYGET:
+            ret_type = resolve_type(tinfo, funcdesc.rettype, type_cache)
 
             # Check if this is an indexed property (getter has parameters)
-            if funcdesc.args and len(funcdesc.args) > 0:
+            if arg_count > 0:
                 # Indexed property - treat as method pair
                 params = []
                 for k, arg in enumerate(funcdesc.args):
                     param_name = func_names[k + 1] if k + 1 < len(func_names) else f'arg{k}'
-                    param_type, _ = get_elemdesc_type(tinfo, arg)  # Ignore is_output for indexed props
+                    param_type, _ = get_elemdesc_type(tinfo, arg, type_cache)  # Ignore is_output for indexed props
                     params.append((param_name, param_type))
 
-                if func_name not in indexed_properties:
-                    indexed_properties[func_name] = {'getter_params': params, 'setter_params': None, 'type': ret_type}
-                else:
-                    indexed_properties[func_name]['getter_params'] = params
-                    indexed_properties[func_name]['type'] = ret_type
+                entry = indexed_properties[func_name]
+                entry['getter_params'] = params
+                entry['type'] = ret_type
             else:
                 # Simple property (no parameters)
                 if func_name not in properties:
@@ -349,36 +391,33 @@ def extract_interface_info(typelib, idx: int, enums: Set[str]) -> Optional[Dict]
             continue
 
         # Handle property setters
-        if funcdesc.invkind in (INVOKE_PROPERTYPUT, INVOKE_PROPERTYPUTREF):
+        if invkind == INVOKE_PROPERTYPUT or invkind == INVOKE_PROPERTYPUTREF:
             # Check if this is an indexed property setter (more than 1 parameter)
             # For indexed setters, args = [index_params..., value]
-            if funcdesc.args and len(funcdesc.args) > 1:
+            if arg_count > 1:
                 # Indexed property setter
                 params = []
                 for k, arg in enumerate(funcdesc.args):
                     param_name = func_names[k + 1] if k + 1 < len(func_names) else f'arg{k}'
-                    param_type, _ = get_elemdesc_type(tinfo, arg)  # Ignore is_output for indexed props
+                    param_type, _ = get_elemdesc_type(tinfo, arg, type_cache)  # Ignore is_output for indexed props
                     params.append((param_name, param_type))
 
-                if func_name not in indexed_properties:
-                    indexed_properties[func_name] = {'getter_params': None, 'setter_params': params, 'type': 'Any'}
-                else:
-                    indexed_properties[func_name]['setter_params'] = params
+                indexed_properties[func_name]['setter_params'] = params
             else:
                 # Simple property setter
                 if func_name in properties:
                     properties[func_name] = (properties[func_name][0], True)
                 else:
                     # Setter without getter - get type from parameter
-                    if funcdesc.args and len(funcdesc.args) > 0:
-                        param_type, _ = get_elemdesc_type(tinfo, funcdesc.args[-1])
+                    if arg_count > 0:
+                        param_type, _ = get_elemdesc_type(tinfo, funcdesc.args[-1], type_cache)
                         properties[func_name] = (param_type, True)
                     else:
                         properties[func_name] = ('Any', True)
             continue
 
         # Regular method (invkind == 1)
-        ret_type = resolve_type(tinfo, funcdesc.rettype)
+        ret_type = resolve_type(tinfo, funcdesc.rettype, type_cache)
 
         # Parameters - get count from args tuple length
         # Track output parameters for return type tuple
@@ -387,7 +426,7 @@ def extract_interface_info(typelib, idx: int, enums: Set[str]) -> Optional[Dict]
         if funcdesc.args:
             for k, arg in enumerate(funcdesc.args):
                 param_name = func_names[k + 1] if k + 1 < len(func_names) else f'arg{k}'
-                param_type, is_output = get_elemdesc_type(tinfo, arg)
+                param_type, is_output = get_elemdesc_type(tinfo, arg, type_cache)
                 if is_output:
                     # Output param becomes optional input and contributes to return tuple
                     params.append((param_name, param_type, True))  # (name, type, is_optional)
@@ -426,14 +465,15 @@ def extract_interface_info(typelib, idx: int, enums: Set[str]) -> Optional[Dict]
                 'return_type': 'None'
             })
 
-    # Convert properties dict to list
-    prop_list = []
-    for prop_name, (prop_type, has_setter) in properties.items():
-        prop_list.append({
-            'name': prop_name,
-            'type': prop_type,
-            'has_setter': has_setter
-        })
+    # Convert properties dict to a name-sorted list in one step (names are unique
+    # keys, so sorting the items only ever compares names)
+    prop_list = [
+        {'name': prop_name, 'type': prop_type, 'has_setter': has_setter}
+        for prop_name, (prop_type, has_setter) in sorted(properties.items())
+    ]
+
+    # Sort methods by name once here so the stub writer can emit them in order
+    methods.sort(key=itemgetter('name'))
 
     return {
         'name': name,
@@ -442,37 +482,8 @@ def extract_interface_info(typelib, idx: int, enums: Set[str]) -> Optional[Dict]
     }
 
 
-def translate_type(type_str: str) -> str:
-    """Translate .tlb enum names to friendly alias names from femap_constants.
-
-    For enums with virtual subsets (like zColor which contains Color, BrushPattern,
-    PenLineStyle), returns a union type.
-
-    For enums with nested groupings (like zGroupDefinitionType -> GroupDef),
-    returns the Type alias (e.g., GroupDefType) since the nested values are
-    IntEnum members.
-    """
-    # Handle Tuple types like "Tuple[zReturnCode, int, Any]"
-    if type_str.startswith('Tuple['):
-        inner = type_str[6:-1]  # Remove "Tuple[" and "]"
-        parts = []
-        depth = 0
-        current = ""
-        for char in inner:
-            if char == '[':
-                depth += 1
-            elif char == ']':
-                depth -= 1
-            elif char == ',' and depth == 0:
-                parts.append(current.strip())
-                current = ""
-                continue
-            current += char
-        if current.strip():
-            parts.append(current.strip())
-        translated_parts = [translate_type(p) for p in parts]
-        return f'Tuple[{", ".join(translated_parts)}]'
-
+def _translate_enum_name(type_str: str) -> str:
+    """Translate a single .tlb enum name to its femap_constants alias."""
     # Check if this enum has virtual subsets (union type)
     if type_str in ENUM_UNION_MAP:
         # Return union of all subset types: Color | BrushPattern | PenLineStyle
@@ -489,6 +500,50 @@ def translate_type(type_str: str) -> str:
     return ENUM_ALIAS_MAP.get(type_str, type_str)
 
 
+# The alias maps are fixed at import time, so every enum name that translates
+# is resolved once here; translate_type is then a single regex substitution
+# over whole identifiers, which also covers names inside Tuple[...] types
+_ENUM_TRANSLATIONS = {
+    name: _translate_enum_name(name) for name in (*ENUM_ALIAS_MAP, *ENUM_UNION_MAP)
+}
+_ENUM_NAME_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(_ENUM_TRANSLATIONS, key=len, reverse=True))) + r')\b'
+)
+
+
+def _substitute_enum_name(match: re.Match) -> str:
+    """re.sub callback: replace a matched enum name with its translation."""
+    return _ENUM_TRANSLATIONS[match.group(0)]
+
+
+@functools.lru_cache(maxsize=None)
+def translate_type(type_str: str) -> str:
+    """Translate .tlb enum names to friendly alias names from femap_constants.
+
+    For enums with virtual subsets (like zColor which contains Color, BrushPattern,
+    PenLineStyle), returns a union type.
+
+    For enums with nested groupings (like zGroupDefinitionType -> GroupDef),
+    returns the Type alias (e.g., GroupDefType) since the nested values are
+    IntEnum members.
+
+    Enum names are replaced wherever they appear as whole identifiers, so
+    "Tuple[zReturnCode, int, Any]" becomes "Tuple[ReturnCode, int, Any]".
+    """
+    return _ENUM_NAME_RE.sub(_substitute_enum_name, type_str)
+
+
+def _format_param(param_info: Tuple, is_optional: bool) -> str:
+    """Format one stub parameter as 'name: Type' or 'name: Type = ...'."""
+    param_name, param_type = param_info[0], param_info[1]
+    # Handle reserved words
+    safe_name = param_name + '_' if param_name in _RESERVED else param_name
+    annotation = translate_type(param_type)
+    if is_optional:
+        return f'{safe_name}: {annotation} = ...'
+    return f'{safe_name}: {annotation}'
+
+
 def generate_stub_file(interfaces: List[Dict], enums: Dict[str, Dict[str, int]],
                        output_path: str) -> Tuple[int, int]:
     """Generate the .pyi stub file.
@@ -500,50 +555,27 @@ def generate_stub_file(interfaces: List[Dict], enums: Dict[str, Dict[str, int]],
     used_enum_types = set()  # Original z* enum names used in type annotations
     deprecated_count = 0
 
-    lines = [
-        '# Auto-generated from Femap type library (.tlb)',
-        '# DO NOT EDIT - regenerate with generate_stubs_tlb.py',
-        '#',
-        '# This file provides authoritative type information extracted directly',
-        '# from the COM type library, including interface types (IMatl, INode)',
-        '# and enum types linked to femap_constants.py aliases.',
-        '#',
-        '# Methods with newer versions available are marked with .. deprecated::',
-        '# docstrings indicating the recommended alternative.',
-        '',
-        'from typing import Any, Tuple, Optional, overload',
-        'from win32com.client import DispatchBaseClass',
-    ]
+    header = (
+        '# Auto-generated from Femap type library (.tlb)\n'
+        '# DO NOT EDIT - regenerate with generate_stubs_tlb.py\n'
+        '#\n'
+        '# This file provides authoritative type information extracted directly\n'
+        '# from the COM type library, including interface types (IMatl, INode)\n'
+        '# and enum types linked to femap_constants.py aliases.\n'
+        '#\n'
+        '# Methods with newer versions available are marked with .. deprecated::\n'
+        '# docstrings indicating the recommended alternative.\n'
+        '\n'
+        'from typing import Any, Tuple, Optional, overload\n'
+        'from win32com.client import DispatchBaseClass\n'
+    )
 
-    # We'll add the femap_constants import after we know which aliases are used
-    import_line_index = len(lines)
-    lines.append('')  # Placeholder for import
-    lines.append('')
-    lines.append('')
-
-    # Add constants class
-    lines.append('class constants:')
-    lines.append('    """Femap constants from type library."""')
-    for enum_name, members in sorted(enums.items()):
-        lines.append(f'    # {enum_name}')
-        for member_name, value in sorted(members.items(), key=lambda x: x[1]):
-            lines.append(f'    {member_name}: int')
-    lines.append('')
-    lines.append('')
-
-    # Add interface classes (sorted for consistency)
     def track_and_translate(type_str: str) -> str:
         """Translate type and track which aliases are used."""
         translated = translate_type(type_str)
         # Track all aliases used (including union types like "Color | BrushPattern | PenLineStyle")
-        for alias in ENUM_ALIAS_MAP.values():
-            if alias in translated:
-                used_aliases.add(alias)
-        # Also track union type components
-        for subsets in ENUM_UNION_MAP.values():
-            for alias in subsets:
-                if alias in translated:
-                    used_aliases.add(alias)
+        # by matching whole identifiers, so one intersection covers every component
+        used_aliases.update(ALL_ALIASES.intersection(_IDENT_RE.findall(translated)))
         # Track Type aliases for nested groupings (e.g., GroupDefType)
         if translated.endswith('Type'):
             used_aliases.add(translated)
@@ -553,90 +585,137 @@ def generate_stub_file(interfaces: List[Dict], enums: Dict[str, Dict[str, int]],
             used_enum_types.add(type_str)
         return translated
 
-    for iface in sorted(interfaces, key=lambda x: x['name']):
-        lines.append(f'class {iface["name"]}(DispatchBaseClass):')
-
-        has_content = False
-
-        # Build version map for this interface's methods
-        version_map = build_version_map(iface['methods'])
-
-        # Properties
-        for prop in sorted(iface['properties'], key=lambda x: x['name']):
-            has_content = True
-            prop_type = track_and_translate(prop['type'])
-            lines.append(f'    @property')
-            lines.append(f'    def {prop["name"]}(self) -> {prop_type}: ...')
-            if prop['has_setter']:
-                lines.append(f'    @{prop["name"]}.setter')
-                lines.append(f'    def {prop["name"]}(self, value: {prop_type}) -> None: ...')
-
-        # Methods
-        for method in sorted(iface['methods'], key=lambda x: x['name']):
-            has_content = True
-            params = ['self']
-            had_optional = False  # Track if we've seen an optional param
+    # The femap_constants import sits near the top of the file, so collect the
+    # used aliases before writing anything; the body can then be streamed out.
+    # translate_type is memoized, so the writer's second lookup is a cache hit.
+    for iface in interfaces:
+        for prop in iface['properties']:
+            track_and_translate(prop['type'])
+        for method in iface['methods']:
             for param_info in method['params']:
-                # Handle both 2-tuple (name, type) and 3-tuple (name, type, is_optional) formats
-                if len(param_info) == 3:
-                    param_name, param_type, is_optional = param_info
+                track_and_translate(param_info[1])
+            track_and_translate(method['return_type'])
+
+    # Build the femap_constants import with used aliases AND enum types
+    import_stmt = ''
+    all_imports = used_aliases | used_enum_types
+    if all_imports:
+        sorted_imports = sorted(all_imports)
+        import_stmt = f'from femap_constants import {", ".join(sorted_imports)}'
+
+    with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        emit = f.write
+        emit(header)
+        emit(import_stmt + '\n')
+        emit('\n\n')
+
+        # Add constants class
+        emit('class constants:\n')
+        emit('    """Femap constants from type library."""\n')
+        for enum_name, members in sorted(enums.items()):
+            emit(f'    # {enum_name}\n')
+            for member_name, value in sorted(members.items(), key=lambda x: x[1]):
+                emit(f'    {member_name}: int\n')
+        emit('\n')
+
+        # Add interface classes (sorted for consistency)
+        for iface in sorted(interfaces, key=itemgetter('name')):
+            emit('\n')
+            emit(f'class {iface["name"]}(DispatchBaseClass):\n')
+
+            has_content = False
+
+            # Build version map for this interface's methods
+            version_map = build_version_map(iface['methods'])
+
+            # Properties (properties and methods arrive name-sorted from extract_interface_info)
+            for prop in iface['properties']:
+                has_content = True
+                prop_type = translate_type(prop['type'])
+                emit(f'    @property\n'
+                     f'    def {prop["name"]}(self) -> {prop_type}: ...\n')
+                if prop['has_setter']:
+                    emit(f'    @{prop["name"]}.setter\n'
+                         f'    def {prop["name"]}(self, value: {prop_type}) -> None: ...\n')
+
+            # Methods
+            for method in iface['methods']:
+                has_content = True
+                # Params are (name, type) or (name, type, is_optional); once one
+                # param is optional, all following must be optional too
+                method_params = method['params']
+                first_optional = next(
+                    (k for k, p in enumerate(method_params) if len(p) == 3 and p[2]),
+                    len(method_params)
+                )
+                param_str = ', '.join([
+                    'self',
+                    *(_format_param(p, k >= first_optional) for k, p in enumerate(method_params)),
+                ])
+                ret_type = translate_type(method['return_type'])
+
+                # Check for version hint
+                version_hint = get_version_hint(method['name'], version_map)
+
+                if version_hint:
+                    # Add method with docstring containing version warning
+                    deprecated_count += 1
+                    emit(f'    def {method["name"]}({param_str}) -> {ret_type}:\n'
+                         f'        """\n'
+                         f'        .. deprecated::\n'
+                         f'            {version_hint}\n'
+                         f'        """\n'
+                         f'        ...\n')
                 else:
-                    param_name, param_type = param_info
-                    is_optional = False
+                    emit(f'    def {method["name"]}({param_str}) -> {ret_type}: ...\n')
 
-                # Once we have an optional param, all following must be optional
-                if had_optional:
-                    is_optional = True
-                if is_optional:
-                    had_optional = True
+            if not has_content:
+                emit('    ...\n')
 
-                # Translate the parameter type
-                param_type = track_and_translate(param_type)
+    return deprecated_count
 
-                # Handle reserved words
-                safe_name = param_name
-                if param_name in ('type', 'id', 'list', 'set', 'from', 'import', 'class', 'in', 'is', 'not', 'and', 'or'):
-                    safe_name = param_name + '_'
 
-                if is_optional:
-                    params.append(f'{safe_name}: {param_type} = ...')
-                else:
-                    params.append(f'{safe_name}: {param_type}')
-
-            param_str = ', '.join(params)
-            ret_type = track_and_translate(method['return_type'])
-
-            # Check for version hint
-            version_hint = get_version_hint(method['name'], version_map)
-
-            if version_hint:
-                # Add method with docstring containing version warning
-                deprecated_count += 1
-                lines.append(f'    def {method["name"]}({param_str}) -> {ret_type}:')
-                lines.append(f'        """')
-                lines.append(f'        .. deprecated::')
-                lines.append(f'            {version_hint}')
-                lines.append(f'        """')
-                lines.append(f'        ...')
-            else:
-                lines.append(f'    def {method["name"]}({param_str}) -> {ret_type}: ...')
+def extract_typelib(typelib) -> Tuple[Dict[str, Dict[str, int]], List[Dict]]:
+    """Extract all enums and dispatch interfaces from a loaded type library.
 
-        if not has_content:
-            lines.append('    ...')
+    Returns: (enums, interfaces) as consumed by generate_stub_file.
+    """
+    count = typelib.GetTypeInfoCount()
+    print(f"Found {count} types in library")
 
-        lines.append('')
+    # Single pass over the library: classify by typekind (cheap, no ITypeInfo
+    # needed) and fetch ITypeInfo/TYPEATTR/name only for enums and dispatch
+    # interfaces. Enums are collected right away; interface handles are kept
+    # for afterwards since their members may reference enums defined later.
+    enums: Dict[str, Dict[str, int]] = {}
+    enum_names: Set[str] = set()
+    iface_items: List[Tuple[Any, Any, str]] = []
 
-    # Now insert the femap_constants import with used aliases AND enum types
-    all_imports = used_aliases | used_enum_types
-    if all_imports:
-        sorted_imports = sorted(all_imports)
-        import_stmt = f'from femap_constants import {", ".join(sorted_imports)}'
-        lines[import_line_index] = import_stmt
+    for i in range(count):
+        typekind = typelib.GetTypeInfoType(i)
+        if typekind != TKIND_ENUM and typekind != TKIND_DISPATCH:
+            continue
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+        tinfo = typelib.GetTypeInfo(i)
+        name = typelib.GetDocumentation(i)[0]
+        attr = tinfo.GetTypeAttr()
 
-    return deprecated_count
+        if typekind == TKIND_ENUM:
+            members = extract_enum_values(tinfo, attr)
+            enums[name] = members
+            enum_names.add(name)
+        else:
+            iface_items.append((tinfo, attr, name))
+
+    # Extract interfaces from the cached handles
+    interfaces: List[Dict] = []
+
+    for tinfo, attr, name in iface_items:
+        iface = extract_interface_info(tinfo, attr, name, enum_names)
+        if iface:
+            interfaces.append(iface)
+
+    return enums, interfaces
 
 
 def main():
@@ -653,6 +732,11 @@ def main():
         default='Pyfemap.pyi',
         help='Output .pyi file path'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-read the .tlb even if a cached extraction of the same file exists'
+    )
     args = parser.parse_args()
 
     # Resolve the .tlb path using multiple strategies
@@ -661,40 +745,21 @@ def main():
         print("ERROR: No type library selected")
         return 1
 
-    print(f"Loading type library: {tlb_path}")
-    try:
-        typelib = pythoncom.LoadTypeLib(tlb_path)
-    except Exception as e:
-        print(f"Error loading type library: {e}")
-        return 1
-
-    count = typelib.GetTypeInfoCount()
-    print(f"Found {count} types in library")
-
-    # First pass: collect all enum names and values
-    enums: Dict[str, Dict[str, int]] = {}
-    enum_names: Set[str] = set()
-
-    for i in range(count):
-        tinfo = typelib.GetTypeInfo(i)
-        name = typelib.GetDocumentation(i)[0]
-        attr = tinfo.GetTypeAttr()
+    # Reuse the extraction from a previous run while the .tlb is unchanged
+    cache_path = parse_cache_path(tlb_path, 'stubs', _PARSE_CACHE_VERSION)
+    parsed = None if args.no_cache else load_parse_cache(cache_path)
 
-        if attr.typekind == TKIND_ENUM:
-            members = extract_enum_values(typelib, i)
-            enums[name] = members
-            enum_names.add(name)
+    if parsed is None:
+        loaded = load_type_library(args.tlb)
+        if loaded is None:
+            return 1
+        tlb_path, typelib = loaded
+        cache_path = parse_cache_path(tlb_path, 'stubs', _PARSE_CACHE_VERSION)
+        parsed = extract_typelib(typelib)
+        save_parse_cache(cache_path, parsed)
 
+    enums, interfaces = parsed
     print(f"Found {len(enums)} enums")
-
-    # Second pass: extract interfaces
-    interfaces: List[Dict] = []
-
-    for i in range(count):
-        iface = extract_interface_info(typelib, i, enum_names)
-        if iface:
-            interfaces.append(iface)
-
     print(f"Found {len(interfaces)} dispatch interfaces")
 
     # Generate stub file